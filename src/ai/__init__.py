@@ -1,4 +1,6 @@
 """AI processing module for paper analysis."""
-from .processor import init_ai_client, process_abstract_with_ai, process_papers_with_ai
+from .processor import init_ai_client, process_abstract_with_ai, score_relevance_with_ai, process_papers_with_ai
+from .translation import translate_abstract, load_translation_memory, save_translation_memory
 
-__all__ = ['init_ai_client', 'process_abstract_with_ai', 'process_papers_with_ai']
+__all__ = ['init_ai_client', 'process_abstract_with_ai', 'score_relevance_with_ai', 'process_papers_with_ai',
+           'translate_abstract', 'load_translation_memory', 'save_translation_memory']
@@ -1,23 +1,32 @@
-"""AI processing for paper abstracts using DashScope API."""
+"""AI processing for paper abstracts using OpenAI-compatible APIs."""
 
 import json
 import os
 import time
 import re
 from collections import defaultdict
-from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor
+
+from .router import ProviderRouter, load_provider_configs
+from .translation import load_translation_memory, save_translation_memory, translate_abstract
+
+# Translation runs beside the analysis call; papers are processed one at a time
+TRANSLATION_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix='translation')
 
 
 def init_ai_client():
-    """Initialize the AI client for DashScope API.
+    """Initialize the AI client routing across configured providers.
+
+    Providers come from ``AI_PROVIDERS`` (see ``load_provider_configs``);
+    setting ``AI_HEDGE=1`` enables hedged requests.
 
     Returns:
-        OpenAI client instance or None if initialization fails
+        ProviderRouter instance or None if initialization fails
     """
     try:
-        client = OpenAI(
-            api_key=os.getenv("DASHSCOPE_API_KEY"),
-            base_url="https://dashscope.aliyuncs.com/compatible-mode/v1",
+        client = ProviderRouter(
+            load_provider_configs(),
+            hedge=os.getenv("AI_HEDGE", "0") == "1",
         )
         return client
     except Exception as e:
@@ -25,14 +34,18 @@ def init_ai_client():
         return None
 
 
-def process_abstract_with_ai(client, title, abstract, domain):
+def process_abstract_with_ai(client, title, abstract, domain, memory=None):
     """Process paper abstract with AI for translation and analysis.
 
+    With a translation memory, translation runs as a separate call
+    concurrently with the analysis call (see ``translate_abstract``).
+
     Args:
-        client: OpenAI client instance
+        client: ProviderRouter instance
         title: Paper title
         abstract: Paper abstract (English)
         domain: Target domain for relevance scoring
+        memory: Optional translation memory dictionary
 
     Returns:
         tuple: (chinese_abstract, main_contribution, keywords, relevance_score)
@@ -40,6 +53,20 @@ def process_abstract_with_ai(client, title, abstract, domain):
     if not client:
         return abstract, "", [], 0
 
+    translation = None
+    if memory is not None:
+        translation = TRANSLATION_EXECUTOR.submit(translate_abstract, client, abstract, memory)
+        tasks = """1. 提取3-5个核心技术关键词
+2. 用一句话总结论文的主要贡献
+3. 评估该论文与"{domain}"领域的关联程度（1-5分，5分表示最相关，1分表示基本不相关）""".format(domain=domain)
+        abstract_field = ""
+    else:
+        tasks = """1. 将摘要翻译成中文
+2. 提取3-5个核心技术关键词
+3. 用一句话总结论文的主要贡献
+4. 评估该论文与"{domain}"领域的关联程度（1-5分，5分表示最相关，1分表示基本不相关）""".format(domain=domain)
+        abstract_field = '\n    "chinese_abstract": "中文摘要翻译",'
+
     try:
         prompt = f"""
 请对以下论文进行分析：
@@ -49,37 +76,30 @@ def process_abstract_with_ai(client, title, abstract, domain):
 目标领域：{domain}
 
 请完成以下任务：
-1. 将摘要翻译成中文
-2. 提取3-5个核心技术关键词
-3. 用一句话总结论文的主要贡献
-4. 评估该论文与"{domain}"领域的关联程度（1-5分，5分表示最相关，1分表示基本不相关）
+{tasks}
 
 请按以下JSON格式返回：
-{{
-    "chinese_abstract": "中文摘要翻译",
+{{{abstract_field}
     "keywords": ["关键词1", "关键词2", "关键词3"],
     "main_contribution": "主要贡献总结",
     "relevance_score": 关联程度评分(1-5的整数)
 }}
 """
 
-        completion = client.chat.completions.create(
-            model=os.getenv("OPENAI_MODEL", "qwen3-max-preview"),
-            messages=[
-                {"role": "system", "content": "你是一个专业的学术论文分析助手，擅长翻译和提取关键信息。"},
-                {"role": "user", "content": prompt},
-            ],
-        )
-
-        # Parse AI response
-        ai_response = completion.choices[0].message.content
+        ai_response = client.complete([
+            {"role": "system", "content": "你是一个专业的学术论文分析助手，擅长翻译和提取关键信息。"},
+            {"role": "user", "content": prompt},
+        ])
 
         # Try to parse JSON
         try:
             json_match = re.search(r'\{.*\}', ai_response, re.DOTALL)
             if json_match:
                 result = json.loads(json_match.group())
-                chinese_abstract = result.get('chinese_abstract', abstract)
+                if translation is not None:
+                    chinese_abstract = translation.result()
+                else:
+                    chinese_abstract = result.get('chinese_abstract', abstract)
                 keywords = result.get('keywords', [])
                 main_contribution = result.get('main_contribution', '')
                 relevance_score = result.get('relevance_score', 3)
@@ -90,34 +110,100 @@ def process_abstract_with_ai(client, title, abstract, domain):
             pass
 
         # If JSON parsing fails, return raw response
+        if translation is not None:
+            return translation.result(), "", [], 3
         return ai_response, "", [], 3
 
     except Exception as e:
         print(f"AI处理失败: {e}")
+        if translation is not None:
+            return translation.result(), "", [], 3
         return abstract, "", [], 3
 
 
-def process_papers_with_ai(filtered_papers, ai_client, domain):
+def score_relevance_with_ai(client, title, abstract, domain):
+    """Score paper relevance only, using the small, fast model.
+
+    Args:
+        client: ProviderRouter instance
+        title: Paper title
+        abstract: Paper abstract (English)
+        domain: Target domain for relevance scoring
+
+    Returns:
+        int: Relevance score (1-5), or None if scoring fails or the reply is
+            not a single digit
+    """
+    if not client:
+        return None
+
+    try:
+        prompt = f"""
+标题：{title}
+摘要：{abstract}
+
+评估该论文与"{domain}"领域的关联程度（1-5分，5分表示最相关，1分表示基本不相关）。
+只返回一个1-5的整数，不要输出其他内容。
+"""
+
+        ai_response = client.complete([
+            {"role": "system", "content": "你是一个专业的学术论文筛选助手。"},
+            {"role": "user", "content": prompt},
+        ], light=True)
+
+        score_match = re.fullmatch(r'\s*([1-5])\s*', ai_response or '')
+        if score_match:
+            return int(score_match.group(1))
+        print(f"AI评分无法解析: {ai_response!r}")
+        return None
+
+    except Exception as e:
+        print(f"AI评分失败: {e}")
+        return None
+
+
+def process_papers_with_ai(filtered_papers, ai_client, domain, cascade_threshold=None):
     """Process filtered papers with AI for translation and analysis.
 
+    With ``cascade_threshold`` set, each paper is first scored by the small
+    model and only papers scoring at least the threshold are sent to the large
+    model; the others keep their original abstract. Papers whose score cannot
+    be parsed go to the large model as well. Translations go through
+    the persistent translation memory, which is saved after all papers.
+
     Args:
         filtered_papers: Dictionary mapping keywords to lists of (title, link, abstract) tuples
-        ai_client: OpenAI client instance
+        ai_client: ProviderRouter instance
         domain: Target domain for relevance scoring
+        cascade_threshold: Minimum small-model score for full processing, None to disable
 
     Returns:
         defaultdict: Dictionary mapping keywords to lists of processed paper dictionaries
     """
     processed_papers = defaultdict(list)
+    memory = load_translation_memory()
 
     for keyword, papers in filtered_papers.items():
         for title, link, abstract in papers:
             print(f"正在处理论文: {title[:50]}...")
 
-            # Process abstract with AI
-            chinese_abstract, main_contribution, ai_keywords, relevance_score = process_abstract_with_ai(
-                ai_client, title, abstract, domain
-            )
+            # Cheap relevance screening before the expensive analysis
+            screening_score = None
+            if cascade_threshold is not None:
+                screening_score = score_relevance_with_ai(ai_client, title, abstract, domain)
+
+            if screening_score is not None and screening_score < cascade_threshold:
+                print(f"相关性评分 {screening_score}，跳过完整分析")
+                chinese_abstract, main_contribution, ai_keywords = abstract, "", []
+                relevance_score = screening_score
+            else:
+                # Process abstract with AI
+                chinese_abstract, main_contribution, ai_keywords, relevance_score = process_abstract_with_ai(
+                    ai_client, title, abstract, domain, memory
+                )
+
+                # 5-second delay after each large-model call
+                time.sleep(5)
 
             # Store processed information
             processed_papers[keyword].append({
@@ -130,7 +216,6 @@ def process_papers_with_ai(filtered_papers, ai_client, domain):
                 'relevance_score': relevance_score
             })
 
-            # 5-second delay between API calls
-            time.sleep(5)
+    save_translation_memory(memory)
 
     return processed_papers
@@ -0,0 +1,298 @@
+"""Routing of chat completions across several OpenAI-compatible providers."""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+from openai import OpenAI, APIConnectionError, APIStatusError
+
+DEFAULT_BASE_URL = "https://dashscope.aliyuncs.com/compatible-mode/v1"
+DEFAULT_MODEL = "qwen3-max-preview"
+DEFAULT_LIGHT_MODEL = "qwen-turbo"
+
+# Latency samples needed before the p95 replaces the fixed hedge delay
+MIN_HEDGE_SAMPLES = 5
+
+
+def load_provider_configs():
+    """Load provider configuration from the environment.
+
+    ``AI_PROVIDERS`` may hold a JSON list of providers, each with ``name``,
+    ``base_url``, ``model`` and either ``api_key`` or ``api_key_env``
+    (optionally ``light_model`` and ``timeout`` in seconds). Without it a
+    single DashScope provider is configured from ``DASHSCOPE_API_KEY``,
+    ``OPENAI_MODEL`` and ``OPENAI_LIGHT_MODEL``. Only that built-in provider
+    gets a default ``light_model``; configured providers must name their own.
+
+    Returns:
+        list: List of provider configuration dictionaries
+    """
+    raw = os.getenv("AI_PROVIDERS")
+    if raw:
+        providers = json.loads(raw)
+    else:
+        providers = [{
+            'name': 'dashscope',
+            'base_url': DEFAULT_BASE_URL,
+            'api_key_env': 'DASHSCOPE_API_KEY',
+            'light_model': os.getenv("OPENAI_LIGHT_MODEL") or DEFAULT_LIGHT_MODEL,
+        }]
+
+    for idx, provider in enumerate(providers):
+        provider.setdefault('name', f"provider-{idx}")
+        provider.setdefault('model', os.getenv("OPENAI_MODEL") or DEFAULT_MODEL)
+        if 'api_key' not in provider:
+            provider['api_key'] = os.getenv(provider.get('api_key_env', 'DASHSCOPE_API_KEY'))
+    return providers
+
+
+class ProviderStats:
+    """Rolling latency / error statistics and circuit breaker state of one provider model."""
+
+    def __init__(self, window):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    def expected_latency(self):
+        """Median latency of recent successful calls (0 if never measured)."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[len(ordered) // 2]
+
+    def p95_latency(self, min_samples=1):
+        """95th percentile latency of recent successful calls, or None."""
+        if len(self.latencies) < min_samples:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def error_rate(self):
+        """Fraction of failed calls in the rolling window."""
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+
+class ProviderRouter:
+    """Route chat completions to the fastest healthy provider.
+
+    Each (provider, model) pair tracks rolling latency and error rate, so a
+    failing light model never blocks the main model of the same provider.
+    After ``failure_threshold`` consecutive failures its circuit opens and it
+    is skipped for ``cooldown`` seconds, after which one trial call is allowed.
+    Light calls go to providers with a ``light_model``, or to the main models
+    when no provider has one.
+    The circuit of the last available provider of a tier never opens.
+    A failed call falls over to the next provider; once none is left,
+    transient errors (connection errors, 408/409/429, 5xx) are retried up to
+    ``max_retries`` times with exponential backoff. With ``hedge`` enabled, a
+    request that has not finished after the provider's p95 latency (or
+    ``hedge_delay`` until enough samples exist) is also sent to the next
+    provider and whichever answers first wins.
+
+    Calls run on daemon threads so that a losing hedged request still waiting
+    for its timeout never keeps the interpreter alive; ``close`` releases the
+    underlying HTTP clients.
+    """
+
+    def __init__(self, providers, window=20, failure_threshold=3, cooldown=60.0,
+                 hedge=False, hedge_delay=10.0, max_retries=2, retry_backoff=1.0):
+        if not providers:
+            raise ValueError("至少需要配置一个AI服务")
+        self.providers = providers
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.window = window
+        self._stats = {}
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def _client(self, provider):
+        with self._lock:
+            client = self._clients.get(provider['name'])
+            if client is None:
+                client = OpenAI(
+                    api_key=provider['api_key'],
+                    base_url=provider['base_url'],
+                    timeout=provider.get('timeout', 120),
+                    max_retries=0,
+                )
+                self._clients[provider['name']] = client
+            return client
+
+    def close(self):
+        """Close the HTTP clients of all providers, aborting calls in flight."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients = {}
+        for client in clients:
+            client.close()
+
+    def _submit(self, fn, *args, **kwargs):
+        future = Future()
+
+        def run():
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, daemon=True).start()
+        return future
+
+    def _model(self, provider, light):
+        if light and provider.get('light_model'):
+            return provider['light_model']
+        return provider['model']
+
+    def _stats_for(self, provider, model):
+        # Caller holds self._lock
+        key = (provider['name'], model)
+        if key not in self._stats:
+            self._stats[key] = ProviderStats(self.window)
+        return self._stats[key]
+
+    def _is_available(self, stats, now):
+        if stats.opened_at is None:
+            return True
+        return now - stats.opened_at >= self.cooldown
+
+    def _tier_providers(self, light):
+        if light and any(p.get('light_model') for p in self.providers):
+            return [p for p in self.providers if p.get('light_model')]
+        return self.providers
+
+    def ranked_providers(self, light=False):
+        """Return available providers ordered by health and expected latency.
+
+        Args:
+            light: Rank by the stats of the light models instead of the main models
+
+        Returns:
+            list: Provider configurations, best candidate first
+        """
+        now = time.monotonic()
+        providers = self._tier_providers(light)
+
+        with self._lock:
+            stats = {p['name']: self._stats_for(p, self._model(p, light)) for p in providers}
+            candidates = [p for p in providers if self._is_available(stats[p['name']], now)]
+            return sorted(candidates, key=lambda p: (
+                stats[p['name']].error_rate(),
+                stats[p['name']].expected_latency(),
+            ))
+
+    def _record(self, provider, light, latency=None):
+        now = time.monotonic()
+        with self._lock:
+            stats = self._stats_for(provider, self._model(provider, light))
+            if latency is None:
+                stats.outcomes.append(False)
+                stats.consecutive_failures += 1
+                others_available = any(
+                    self._is_available(self._stats_for(p, self._model(p, light)), now)
+                    for p in self._tier_providers(light) if p is not provider
+                )
+                if stats.consecutive_failures >= self.failure_threshold and others_available:
+                    stats.opened_at = now
+            else:
+                stats.outcomes.append(True)
+                stats.latencies.append(latency)
+                stats.consecutive_failures = 0
+                stats.opened_at = None
+
+    def _call(self, provider, messages, light=False, **kwargs):
+        model = self._model(provider, light)
+        start = time.monotonic()
+        try:
+            completion = self._client(provider).chat.completions.create(
+                model=model,
+                messages=messages,
+                **kwargs
+            )
+            content = completion.choices[0].message.content
+        except Exception:
+            self._record(provider, light)
+            raise
+        self._record(provider, light, time.monotonic() - start)
+        return content
+
+    @staticmethod
+    def _is_retryable(error):
+        if isinstance(error, APIConnectionError):
+            return True
+        if isinstance(error, APIStatusError):
+            return error.status_code in (408, 409, 429) or error.status_code >= 500
+        return False
+
+    def _hedge_timeout(self, provider, light=False):
+        with self._lock:
+            p95 = self._stats_for(provider, self._model(provider, light)).p95_latency(MIN_HEDGE_SAMPLES)
+        return p95 if p95 is not None else self.hedge_delay
+
+    def complete(self, messages, light=False, **kwargs):
+        """Send a chat completion through the best available provider.
+
+        Args:
+            messages: Chat messages in OpenAI format
+            light: Use each provider's small, fast ``light_model`` instead of ``model``
+            **kwargs: Extra arguments passed to ``chat.completions.create``
+
+        Returns:
+            str: Content of the first successful response
+
+        Raises:
+            RuntimeError: If no provider is available or all of them fail
+        """
+        candidates = self.ranked_providers(light)
+        if not candidates:
+            raise RuntimeError("所有AI服务均处于熔断状态")
+
+        pending = {}
+        errors = []
+        retries = 0
+
+        def launch():
+            provider = candidates.pop(0)
+            future = self._submit(self._call, provider, messages, light, **kwargs)
+            pending[future] = provider
+
+        launch()
+        while pending:
+            timeout = None
+            if self.hedge and candidates:
+                timeout = min(self._hedge_timeout(p, light) for p in pending.values())
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done:
+                # Primary is slower than its p95: hedge with the next provider
+                launch()
+                continue
+
+            for future in done:
+                provider = pending.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    print(f"AI服务 {provider['name']} 调用失败: {e}")
+                    errors.append(e)
+
+            if not pending and candidates:
+                launch()
+            elif not pending and retries < self.max_retries and self._is_retryable(errors[-1]):
+                # No provider left to fail over to: back off and retry the last one
+                time.sleep(self.retry_backoff * 2 ** retries)
+                retries += 1
+                candidates.append(provider)
+                launch()
+
+        raise RuntimeError(f"所有AI服务调用失败: {errors[-1]}")
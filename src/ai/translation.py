@@ -0,0 +1,204 @@
+"""Abstract translation with a persistent sentence-level translation memory."""
+
+import json
+import os
+import re
+
+# Kept out of git (see .gitignore); the workflow persists it with actions/cache
+TRANSLATION_MEMORY_PATH = os.path.join("cache", "translation_memory.json")
+
+# Oldest sentences and least used terms are evicted to keep the file bounded
+MAX_MEMORY_SENTENCES = 20000
+MAX_MEMORY_TERMS = 2000
+MAX_GLOSSARY_TERMS = 30
+
+# Glossary terms are matched as runs of up to this many words
+MAX_TERM_WORDS = 4
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+
+SENTENCE_PATTERN = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9(\["])')
+
+# A split after one of these is undone, e.g. "as shown in Fig. 3" stays whole
+ABBREVIATION_PATTERN = re.compile(
+    r'(?:^|[\s(])(?:e\.g|i\.e|et al|figs?|eqs?|sec|tab|vs|cf|etc|approx|resp|no)\.$',
+    re.IGNORECASE
+)
+
+
+def load_translation_memory(path=TRANSLATION_MEMORY_PATH):
+    """Load the translation memory from disk.
+
+    Args:
+        path: Path of the JSON memory file
+
+    Returns:
+        dict: Memory with ``sentences`` (English -> Chinese) and ``terms``
+            (English term -> {Chinese rendering: count})
+    """
+    memory = {'sentences': {}, 'terms': {}}
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                memory['sentences'] = data.get('sentences', {})
+                memory['terms'] = data.get('terms', {})
+                print(f"加载翻译记忆: {len(memory['sentences'])} 句, {len(memory['terms'])} 个术语")
+        except Exception as e:
+            print(f"加载翻译记忆失败: {e}")
+    return memory
+
+
+def _prune_terms(terms):
+    """Drop one-off alternative renderings and keep the most used terms."""
+    pruned = {}
+    for term, renderings in terms.items():
+        if not renderings:
+            continue
+        if max(renderings.values()) > 1:
+            renderings = {chinese: count for chinese, count in renderings.items() if count > 1}
+        pruned[term] = renderings
+
+    if len(pruned) > MAX_MEMORY_TERMS:
+        kept = sorted(pruned, key=lambda term: sum(pruned[term].values()), reverse=True)[:MAX_MEMORY_TERMS]
+        pruned = {term: pruned[term] for term in kept}
+    return pruned
+
+
+def save_translation_memory(memory, path=TRANSLATION_MEMORY_PATH):
+    """Save the translation memory to disk.
+
+    Args:
+        memory: Translation memory dictionary
+        path: Path of the JSON memory file
+    """
+    sentences = memory['sentences']
+    if len(sentences) > MAX_MEMORY_SENTENCES:
+        memory['sentences'] = dict(list(sentences.items())[-MAX_MEMORY_SENTENCES:])
+    memory['terms'] = _prune_terms(memory['terms'])
+
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(memory, f, ensure_ascii=False, separators=(',', ':'))
+        print(f"保存翻译记忆到: {path}")
+    except Exception as e:
+        print(f"保存翻译记忆失败: {e}")
+
+
+def split_sentences(text):
+    """Split an English abstract into whitespace-normalized sentences."""
+    text = ' '.join(text.split())
+    sentences = []
+    for piece in SENTENCE_PATTERN.split(text):
+        if not piece:
+            continue
+        if sentences and ABBREVIATION_PATTERN.search(sentences[-1]):
+            sentences[-1] += ' ' + piece
+        else:
+            sentences.append(piece)
+    return sentences
+
+
+def build_glossary(memory, text):
+    """Select glossary entries from past outputs whose term occurs in text.
+
+    Args:
+        memory: Translation memory dictionary
+        text: English text to be translated
+
+    Returns:
+        dict: English term -> most frequent Chinese rendering
+    """
+    words = WORD_PATTERN.findall(text.lower())
+    phrases = {
+        ' '.join(words[i:i + n])
+        for n in range(1, MAX_TERM_WORDS + 1)
+        for i in range(len(words) - n + 1)
+    }
+
+    matches = []
+    for term, renderings in memory['terms'].items():
+        if renderings and ' '.join(WORD_PATTERN.findall(term.lower())) in phrases:
+            chinese, count = max(renderings.items(), key=lambda item: item[1])
+            matches.append((count, term, chinese))
+
+    matches.sort(reverse=True)
+    return {term: chinese for _, term, chinese in matches[:MAX_GLOSSARY_TERMS]}
+
+
+def _remember_terms(memory, terms):
+    for term, chinese in terms.items():
+        if not isinstance(term, str) or not isinstance(chinese, str) or not term.strip() or not chinese.strip():
+            continue
+        renderings = memory['terms'].setdefault(term.strip(), {})
+        renderings[chinese.strip()] = renderings.get(chinese.strip(), 0) + 1
+
+
+def translate_abstract(client, abstract, memory):
+    """Translate an abstract into Chinese, reusing cached sentences.
+
+    Only sentences missing from the memory are sent to the model, together
+    with a glossary of previously used term translations.
+
+    Args:
+        client: ProviderRouter instance
+        abstract: Paper abstract (English)
+        memory: Translation memory dictionary, updated in place
+
+    Returns:
+        str: Chinese abstract, or the original abstract if translation fails
+    """
+    sentences = split_sentences(abstract)
+    cache = memory['sentences']
+    missing = [s for s in dict.fromkeys(sentences) if s not in cache]
+
+    if missing:
+        glossary = build_glossary(memory, ' '.join(missing))
+        glossary_text = "\n".join(f"{term}: {chinese}" for term, chinese in glossary.items()) or "无"
+        prompt = f"""
+请将以下英文句子逐句翻译成中文，保持句子数量和顺序不变。
+
+术语表（请使用一致的译法）：
+{glossary_text}
+
+待翻译句子（JSON列表）：
+{json.dumps(missing, ensure_ascii=False)}
+
+请按以下JSON格式返回：
+{{
+    "translations": ["译文1", "译文2"],
+    "terms": {{"英文术语": "中文译法"}}
+}}
+其中terms列出句子中出现的专业术语及其译法。
+"""
+
+        try:
+            ai_response = client.complete([
+                {"role": "system", "content": "你是一个专业的学术论文翻译助手。"},
+                {"role": "user", "content": prompt},
+            ])
+            json_match = re.search(r'\{.*\}', ai_response, re.DOTALL)
+            result = json.loads(json_match.group()) if json_match else {}
+        except Exception as e:
+            print(f"AI翻译失败: {e}")
+            return abstract
+
+        translations = result.get('translations', [])
+        if not isinstance(translations, list) or len(translations) != len(missing):
+            # Sentence alignment lost: a partial join would silently drop sentences
+            print(f"AI翻译句子数不匹配: 期望 {len(missing)} 句")
+            return abstract
+
+        for sentence, translation in zip(missing, translations):
+            cache[sentence] = str(translation)
+        if isinstance(result.get('terms'), dict):
+            _remember_terms(memory, result['terms'])
+
+    # Refresh recency of reused sentences so eviction drops stale ones first
+    for sentence in sentences:
+        cache[sentence] = cache.pop(sentence)
+
+    return ''.join(cache[s] for s in sentences)
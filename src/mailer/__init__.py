@@ -1,4 +1,5 @@
 """Email sending module."""
 from .sender import sendEmail, generate_email_html
+from .digest import shape_digest
 
-__all__ = ['sendEmail', 'generate_email_html']
+__all__ = ['sendEmail', 'generate_email_html', 'shape_digest']
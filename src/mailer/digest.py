@@ -0,0 +1,54 @@
+"""Digest shaping between AI processing and email rendering."""
+
+import heapq
+
+
+def shape_digest(processed_papers, min_score=2, top_n=10, overflow_limit=30):
+    """Deduplicate, filter and rank processed papers for the email digest.
+
+    A paper matching several keywords is kept only in the first keyword
+    section it appeared in. Papers scoring below ``min_score`` are dropped,
+    the ``top_n`` best-scoring papers of each section are rendered in full and
+    up to ``overflow_limit`` further papers are collapsed into a link list.
+
+    Args:
+        processed_papers: Dictionary mapping keywords to lists of processed paper dictionaries
+        min_score: Minimum relevance score for a paper to be included
+        top_n: Maximum number of fully rendered papers per keyword
+        overflow_limit: Maximum number of overflow links per keyword
+
+    Returns:
+        tuple: (digest, overflow, hidden_counts) where digest and overflow map
+            keywords to lists of paper dictionaries sorted by relevance and
+            hidden_counts maps keywords to the number of papers left out
+    """
+    digest = {}
+    overflow = {}
+    hidden_counts = {}
+    seen_links = set()
+
+    for keyword, papers in processed_papers.items():
+        candidates = []
+        for idx, paper in enumerate(papers):
+            if paper['link'] in seen_links:
+                continue
+            seen_links.add(paper['link'])
+            if paper.get('relevance_score', 3) < min_score:
+                continue
+            # Arrival order breaks ties between equally scored papers
+            candidates.append((paper.get('relevance_score', 3), -idx, paper))
+
+        if not candidates:
+            continue
+
+        top = heapq.nlargest(top_n, candidates, key=lambda item: item[:2])
+        digest[keyword] = [paper for _, _, paper in top]
+
+        if len(candidates) > top_n:
+            top_ids = {id(paper) for _, _, paper in top}
+            rest = [item for item in candidates if id(item[2]) not in top_ids]
+            shown = heapq.nlargest(overflow_limit, rest, key=lambda item: item[:2])
+            overflow[keyword] = [paper for _, _, paper in shown]
+            hidden_counts[keyword] = len(rest) - len(shown)
+
+    return digest, overflow, hidden_counts
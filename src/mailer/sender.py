@@ -17,13 +17,15 @@ COLOR_SCHEMES = [
 ]
 
 
-def generate_email_html(processed_papers, ai_client, domain):
+def generate_email_html(processed_papers, ai_client, domain, overflow=None, hidden_counts=None):
     """Generate HTML email content from processed papers.
 
     Args:
         processed_papers: Dictionary mapping keywords to lists of processed paper dictionaries
         ai_client: AI client instance (for AI badge display)
         domain: Target domain name
+        overflow: Optional dictionary mapping keywords to papers rendered as a compact link list
+        hidden_counts: Optional dictionary mapping keywords to the number of omitted papers
 
     Returns:
         str: Complete HTML email content
@@ -242,9 +244,28 @@ def generate_email_html(processed_papers, ai_client, domain):
             font-size: 14px;
             opacity: 0.9;
         }
+        .overflow-list {
+            margin-top: 10px;
+            padding: 10px 15px;
+            background-color: white;
+            border-radius: 8px;
+            border: 1px solid #e0e0e0;
+            font-size: 13px;
+        }
+        .overflow-list ul {
+            margin: 5px 0;
+            padding-left: 20px;
+        }
+        .overflow-list a {
+            color: #1890ff;
+            padding: 0;
+            font-weight: normal;
+        }
     </style>
     """
 
+    overflow = overflow or {}
+    hidden_counts = hidden_counts or {}
     main_html = []
 
     for idx, (keyword, papers) in enumerate(processed_papers.items()):
@@ -275,6 +296,24 @@ def generate_email_html(processed_papers, ai_client, domain):
                 1: '不相关'
             }.get(relevance_score, '一般')
 
+            # Papers skipped by AI keep only the original abstract
+            if paper['chinese_abstract'] == paper['original_abstract']:
+                abstract_html = f'<div class="abstract-label">原文摘要</div><div class="paper-abstract original-abstract">{paper["original_abstract"]}</div>'
+            else:
+                abstract_html = """
+                    <div class="abstract-label">中文摘要 (AI翻译)</div>
+                    <div class="paper-abstract chinese-abstract">{chinese_abstract}</div>
+                    <details>
+                        <summary style="font-size: 12px; color: #666; padding: 5px 0; border: none; background: none;">
+                            📄 查看原文摘要
+                        </summary>
+                        <div class="paper-abstract original-abstract">{original_abstract}</div>
+                    </details>
+                """.format(
+                    chinese_abstract=paper['chinese_abstract'],
+                    original_abstract=paper['original_abstract']
+                )
+
             paper_item = """
             <details class="paper-details">
                 <summary class="paper-summary">
@@ -286,14 +325,7 @@ def generate_email_html(processed_papers, ai_client, domain):
                 <div class="paper-content">
                     {contribution_html}
                     {ai_keywords_html}
-                    <div class="abstract-label">中文摘要 (AI翻译)</div>
-                    <div class="paper-abstract chinese-abstract">{chinese_abstract}</div>
-                    <details>
-                        <summary style="font-size: 12px; color: #666; padding: 5px 0; border: none; background: none;">
-                            📄 查看原文摘要
-                        </summary>
-                        <div class="paper-abstract original-abstract">{original_abstract}</div>
-                    </details>
+                    {abstract_html}
                     <div class="paper-link">
                         <a href="{link}" target="_blank" style="background-color: {color_primary};">
                             Read Full Paper →
@@ -303,8 +335,7 @@ def generate_email_html(processed_papers, ai_client, domain):
             </details>
             """.format(
                 title=paper['title'],
-                chinese_abstract=paper['chinese_abstract'],
-                original_abstract=paper['original_abstract'],
+                abstract_html=abstract_html,
                 link=paper['link'],
                 color_primary=color_scheme['primary'],
                 contribution_html=contribution_html,
@@ -316,6 +347,19 @@ def generate_email_html(processed_papers, ai_client, domain):
             )
             paper_html.append(paper_item)
 
+        # Collapse papers beyond the per-keyword cap into a link list
+        overflow_papers = overflow.get(keyword, [])
+        hidden_count = hidden_counts.get(keyword, 0)
+        if overflow_papers or hidden_count:
+            links = [
+                f'<li><a href="{paper["link"]}" target="_blank">{paper["title"]}</a> ({paper.get("relevance_score", 3)}★)</li>'
+                for paper in overflow_papers
+            ]
+            hidden_html = f'<div>…另有 {hidden_count} 篇未列出</div>' if hidden_count else ''
+            paper_html.append(
+                f'<div class="overflow-list"><strong>更多论文：</strong><ul>{"".join(links)}</ul>{hidden_html}</div>'
+            )
+
         paper_html = "\n".join(paper_html)
 
         keyword_section = """
@@ -331,7 +375,7 @@ def generate_email_html(processed_papers, ai_client, domain):
         """.format(
             subject=keyword,
             paper_html=paper_html,
-            paper_count=len(papers),
+            paper_count=len(papers) + len(overflow_papers) + hidden_count,
             color_primary=color_scheme['primary'],
             color_light=color_scheme['light']
         )
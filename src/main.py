@@ -17,8 +17,8 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from arxiv import get_arxiv_data, filter_keywords
 from ai import init_ai_client, process_papers_with_ai
-from mailer import sendEmail, generate_email_html
-from utils import load_previous_papers, save_today_papers
+from mailer import sendEmail, generate_email_html, shape_digest
+from utils import load_previous_papers, save_today_papers, compact_papers, index_papers
 
 
 def main(args):
@@ -38,6 +38,9 @@ def main(args):
     # Save today's paper records
     save_today_papers(dic)
 
+    # Merge daily records of completed months into monthly partitions
+    compact_papers()
+
     # Load previous day's paper records
     previous_papers = load_previous_papers()
 
@@ -55,7 +58,10 @@ def main(args):
     # Process papers with AI
     if ai_client and len(filtered_res) > 0:
         print("开始使用AI处理论文...")
-        res = process_papers_with_ai(filtered_res, ai_client, args.domain)
+        res = process_papers_with_ai(
+            filtered_res, ai_client, args.domain,
+            cascade_threshold=args.cascade_threshold if args.cascade else None
+        )
     else:
         # If AI is unavailable, convert to old format
         res = {}
@@ -72,15 +78,31 @@ def main(args):
                     'relevance_score': 3  # Default score
                 })
 
+    # Add processed papers to the local search index
+    if len(res) > 0:
+        try:
+            indexed_count = index_papers(res)
+            print(f"已写入检索索引: {indexed_count} 篇")
+        except Exception as e:
+            print(f"写入检索索引失败: {e}")
+
+    # Deduplicate, filter and rank papers for the digest
+    digest, overflow, hidden_counts = shape_digest(
+        res, min_score=args.min_score, top_n=args.top_n, overflow_limit=args.overflow_limit
+    )
+
     # Send email
-    if len(res) == 0:
+    if len(digest) == 0:
         print("没有新的文章")
     else:
         # Generate email HTML content
-        content = generate_email_html(res, ai_client, args.domain)
+        content = generate_email_html(digest, ai_client, args.domain, overflow, hidden_counts)
         print("生成邮件内容成功")
         sendEmail(args.email, args.receiver, args.token, args.title, content)
 
+    if ai_client:
+        ai_client.close()
+
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='ArXiv Daily Paper Notification System')
@@ -94,6 +116,16 @@ if __name__ == '__main__':
                        help='搜索关键词列表')
     parser.add_argument('-d', '--domain', type=str, default='自动驾驶',
                        help='目标领域名称，用于相关性评分')
+    parser.add_argument('--cascade', action='store_true',
+                       help='先用小模型评分，仅对相关论文调用大模型翻译和分析')
+    parser.add_argument('--cascade-threshold', type=int, default=3,
+                       help='级联模式下进入大模型分析的最低评分')
+    parser.add_argument('--min-score', type=int, default=2,
+                       help='邮件中展示论文的最低相关性评分')
+    parser.add_argument('--top-n', type=int, default=10,
+                       help='每个关键词完整展示的论文数量')
+    parser.add_argument('--overflow-limit', type=int, default=30,
+                       help='每个关键词折叠为链接列表的论文数量上限')
     args = parser.parse_args()
     args.title = "arxiv Daily"
 
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+'''
+@File    :   search.py
+@Desc    :   检索本地论文索引
+'''
+
+import argparse
+import sys
+import os
+import time
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils import search_papers, SEARCH_INDEX_PATH
+
+
+def main(args):
+    """Run a query against the local search index and print the results.
+
+    Args:
+        args: Parsed command line arguments
+    """
+    start = time.perf_counter()
+    results = search_papers(
+        ' '.join(args.query),
+        since=args.since,
+        until=args.until,
+        keyword=args.keyword,
+        min_score=args.min_score,
+        limit=args.limit,
+        db_path=args.index,
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+
+    for idx, paper in enumerate(results, 1):
+        print(f"{idx}. [{paper['date']}] {paper['title']}  (相关度: {paper['relevance_score']})")
+        print(f"   {paper['link']}")
+        if paper['ai_keywords']:
+            print(f"   关键词: {', '.join(paper['ai_keywords'])}")
+        if paper['main_contribution']:
+            print(f"   主要贡献: {paper['main_contribution']}")
+
+    print(f"共找到 {len(results)} 篇论文，耗时 {elapsed:.1f} ms")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Search locally indexed ArXiv papers')
+    parser.add_argument('query', nargs='*',
+                       help='检索词（中英文均可，留空则按日期列出）')
+    parser.add_argument('--since', type=str, default=None,
+                       help='起始日期 YYYY-MM-DD')
+    parser.add_argument('--until', type=str, default=None,
+                       help='结束日期 YYYY-MM-DD')
+    parser.add_argument('-k', '--keyword', type=str, default=None,
+                       help='订阅关键词过滤')
+    parser.add_argument('-s', '--min-score', type=int, default=None,
+                       help='最低相关性评分')
+    parser.add_argument('-n', '--limit', type=int, default=20,
+                       help='返回结果数量')
+    parser.add_argument('--index', type=str, default=SEARCH_INDEX_PATH,
+                       help='索引数据库路径')
+    args = parser.parse_args()
+
+    main(args)
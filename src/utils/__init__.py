@@ -1,4 +1,5 @@
 """Utility modules."""
-from .deduplication import load_previous_papers, save_today_papers
+from .deduplication import load_previous_papers, save_today_papers, compact_papers
+from .search_index import index_papers, search_papers, SEARCH_INDEX_PATH
 
-__all__ = ['load_previous_papers', 'save_today_papers']
+__all__ = ['load_previous_papers', 'save_today_papers', 'compact_papers', 'index_papers', 'search_papers', 'SEARCH_INDEX_PATH']
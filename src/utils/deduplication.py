@@ -1,68 +1,175 @@
-"""Paper deduplication utilities using YAML storage."""
+"""Paper deduplication utilities using partitioned, append-only storage.
+
+Each run appends today's titles to a gzip JSONL daily segment
+(``papers/segments/YYYY-MM-DD.jsonl.gz``). Compaction merges the daily
+segments of completed months into one monthly partition
+(``papers/YYYY-MM.jsonl.gz``). Legacy ``papers/YYYY-MM-DD.yaml`` files are
+still read and are migrated into monthly partitions by compaction.
+"""
 
 import datetime
+import glob
+import gzip
+import json
 import os
+import re
 import yaml
 
+PAPERS_DIR = "papers"
+SEGMENTS_DIR = os.path.join(PAPERS_DIR, "segments")
+
+DAILY_FILE_PATTERN = re.compile(r'^(\d{4}-\d{2})-\d{2}\.(jsonl\.gz|yaml)$')
+
+
+def _segment_path(date_str):
+    return os.path.join(SEGMENTS_DIR, f"{date_str}.jsonl.gz")
+
+
+def _partition_path(month_str):
+    return os.path.join(PAPERS_DIR, f"{month_str}.jsonl.gz")
+
+
+def _legacy_path(date_str):
+    return os.path.join(PAPERS_DIR, f"{date_str}.yaml")
+
 
-def load_previous_papers():
-    """Load previous day's paper records for deduplication.
+def _read_records(path):
+    """Read day records from a gzip JSONL file or a legacy YAML file.
 
     Returns:
-        set: Set of paper titles from the previous day
+        dict: Mapping of date string to list of paper titles; later records
+            for the same date replace earlier ones
+    """
+    records = {}
+    if path.endswith('.yaml'):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f)
+            if data and 'papers' in data:
+                records[str(data.get('date'))] = data['papers']
+    else:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    record = json.loads(line)
+                    records[record['date']] = record['papers']
+    return records
+
+
+def load_previous_papers(lookback_days=1):
+    """Load paper records of the previous days for deduplication.
+
+    Only the daily segments and monthly partitions covering the lookback
+    window are read.
+
+    Args:
+        lookback_days: Number of days before today to load
+
+    Returns:
+        set: Set of paper titles from the lookback window
     """
-    papers_dir = "papers"
     previous_papers = set()
+    today = datetime.date.today()
+    partitions = {}
 
-    # Get yesterday's date
-    yesterday = datetime.date.today() - datetime.timedelta(days=1)
-    yesterday_str = yesterday.strftime('%Y-%m-%d')
-    yaml_path = os.path.join(papers_dir, f"{yesterday_str}.yaml")
+    for offset in range(1, lookback_days + 1):
+        date_str = (today - datetime.timedelta(days=offset)).strftime('%Y-%m-%d')
+        month_str = date_str[:7]
 
-    if os.path.exists(yaml_path):
         try:
-            with open(yaml_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-                if data and 'papers' in data:
-                    previous_papers = set(data['papers'])
-                    print(f"加载前一天的论文记录: {len(previous_papers)} 篇")
+            titles = None
+            for path in (_segment_path(date_str), _legacy_path(date_str)):
+                if os.path.exists(path):
+                    titles = _read_records(path).get(date_str)
+                    break
+
+            if titles is None:
+                if month_str not in partitions:
+                    path = _partition_path(month_str)
+                    partitions[month_str] = _read_records(path) if os.path.exists(path) else {}
+                titles = partitions[month_str].get(date_str)
+
+            if titles:
+                previous_papers.update(titles)
         except Exception as e:
-            print(f"加载前一天论文记录失败: {e}")
+            print(f"加载 {date_str} 论文记录失败: {e}")
+
+    if previous_papers:
+        print(f"加载前 {lookback_days} 天的论文记录: {len(previous_papers)} 篇")
 
     return previous_papers
 
 
 def save_today_papers(papers_dict):
-    """Save today's paper titles to YAML file.
+    """Append today's paper titles to today's daily segment.
 
     Args:
         papers_dict: Dictionary mapping paper titles to (link, abstract) tuples
     """
-    papers_dir = "papers"
-
-    # Create papers directory if it doesn't exist
-    if not os.path.exists(papers_dir):
-        os.makedirs(papers_dir)
-        print(f"创建目录: {papers_dir}")
+    # Create segments directory if it doesn't exist
+    if not os.path.exists(SEGMENTS_DIR):
+        os.makedirs(SEGMENTS_DIR)
+        print(f"创建目录: {SEGMENTS_DIR}")
 
-    # Get today's date
     today = datetime.date.today().strftime('%Y-%m-%d')
-    yaml_path = os.path.join(papers_dir, f"{today}.yaml")
+    segment_path = _segment_path(today)
 
-    # Extract all paper titles
-    paper_titles = list(papers_dict.keys())
-
-    # Build YAML data structure
-    data = {
+    record = {
         'date': today,
-        'total_count': len(paper_titles),
-        'papers': paper_titles
+        'papers': list(papers_dict.keys())
     }
 
-    # Save to YAML file
+    # Append a new gzip member; readers keep the last record of a date
     try:
-        with open(yaml_path, 'w', encoding='utf-8') as f:
-            yaml.dump(data, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
-        print(f"保存今天的论文记录到: {yaml_path}")
+        with gzip.open(segment_path, 'at', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        print(f"保存今天的论文记录到: {segment_path}")
     except Exception as e:
         print(f"保存论文记录失败: {e}")
+
+
+def compact_papers():
+    """Merge daily segments and legacy YAML files of completed months.
+
+    Each completed month is rewritten as a single monthly partition holding
+    one ``{"date", "papers"}`` record per day, and the merged daily files are
+    removed. The current month is left as daily segments so that daily runs
+    only ever add small files.
+
+    Returns:
+        int: Number of daily files merged
+    """
+    current_month = datetime.date.today().strftime('%Y-%m')
+    daily_files = {}
+
+    # Legacy YAML files first so that segments of the same date take precedence
+    for path in glob.glob(os.path.join(PAPERS_DIR, "*.yaml")) + glob.glob(os.path.join(SEGMENTS_DIR, "*.jsonl.gz")):
+        match = DAILY_FILE_PATTERN.match(os.path.basename(path))
+        if match and match.group(1) < current_month:
+            daily_files.setdefault(match.group(1), []).append(path)
+
+    merged_count = 0
+    for month_str, paths in sorted(daily_files.items()):
+        partition_path = _partition_path(month_str)
+        try:
+            records = _read_records(partition_path) if os.path.exists(partition_path) else {}
+            for path in paths:
+                records.update(_read_records(path))
+
+            tmp_path = partition_path + ".tmp"
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                for date_str in sorted(records):
+                    f.write(json.dumps({'date': date_str, 'papers': records[date_str]}, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, partition_path)
+
+            for path in paths:
+                os.remove(path)
+            merged_count += len(paths)
+            print(f"压缩 {month_str} 的论文记录: {len(paths)} 个文件 -> {partition_path}")
+        except Exception as e:
+            # Keep the existing partition and daily files; drop any half-written merge
+            if os.path.exists(partition_path + ".tmp"):
+                os.remove(partition_path + ".tmp")
+            print(f"压缩 {month_str} 论文记录失败: {e}")
+
+    return merged_count
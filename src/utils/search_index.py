@@ -0,0 +1,207 @@
+"""Local full-text search index over received papers using SQLite FTS5."""
+
+import datetime
+import os
+import re
+import sqlite3
+
+# Kept out of git (see .gitignore); the workflow persists it with actions/cache
+SEARCH_INDEX_PATH = os.path.join("cache", "search.db")
+
+# CJK characters are indexed one per token so that Chinese text can be matched
+# by the unicode61 tokenizer, which otherwise treats a whole CJK run as one word.
+CJK_PATTERN = re.compile(r'([㐀-䶿一-鿿豈-﫿])')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    id INTEGER PRIMARY KEY,
+    link TEXT UNIQUE NOT NULL,
+    date TEXT NOT NULL,
+    title TEXT NOT NULL,
+    original_abstract TEXT,
+    chinese_abstract TEXT,
+    main_contribution TEXT,
+    ai_keywords TEXT,
+    relevance_score INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_papers_date ON papers(date);
+CREATE INDEX IF NOT EXISTS idx_papers_score ON papers(relevance_score);
+CREATE TABLE IF NOT EXISTS paper_keywords (
+    paper_id INTEGER NOT NULL,
+    keyword TEXT NOT NULL,
+    PRIMARY KEY (paper_id, keyword)
+);
+CREATE INDEX IF NOT EXISTS idx_paper_keywords_keyword ON paper_keywords(keyword);
+CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+    title, abstract, chinese_abstract, ai_keywords,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# Column weights for bm25(): title and AI keywords matter more than abstract body
+BM25_WEIGHTS = (10.0, 1.0, 1.0, 5.0)
+
+
+def _segment(text):
+    """Insert spaces around CJK characters so each one becomes a token."""
+    return CJK_PATTERN.sub(r' \1 ', text or '')
+
+
+def _build_match_query(query):
+    """Turn free text into an FTS5 MATCH expression.
+
+    Every whitespace separated term is quoted as a phrase (so Chinese words
+    become phrases of single characters) and all terms must match.
+    """
+    terms = []
+    for term in query.split():
+        tokens = _segment(term.replace('"', ' ')).split()
+        if tokens:
+            terms.append('"' + ' '.join(tokens) + '"')
+    return ' '.join(terms)
+
+
+def open_search_index(db_path=SEARCH_INDEX_PATH):
+    """Open (and create if needed) the search index database.
+
+    Args:
+        db_path: Path of the SQLite database file
+
+    Returns:
+        sqlite3.Connection: Connection to the index
+    """
+    directory = os.path.dirname(db_path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def index_papers(processed_papers, date=None, db_path=SEARCH_INDEX_PATH):
+    """Incrementally add processed papers to the search index.
+
+    Papers are keyed by link, so re-indexing a paper updates it in place and
+    records any additional subscription keyword it matched.
+
+    Args:
+        processed_papers: Dictionary mapping keywords to lists of processed paper dictionaries
+        date: Date string (YYYY-MM-DD) the papers were received, defaults to today
+        db_path: Path of the SQLite database file
+
+    Returns:
+        int: Number of distinct papers written to the index
+    """
+    if date is None:
+        date = datetime.date.today().strftime('%Y-%m-%d')
+
+    paper_ids = set()
+    conn = open_search_index(db_path)
+    try:
+        with conn:
+            for keyword, papers in processed_papers.items():
+                for paper in papers:
+                    ai_keywords = ', '.join(paper.get('ai_keywords') or [])
+                    row = conn.execute("SELECT id FROM papers WHERE link = ?", (paper['link'],)).fetchone()
+                    if row:
+                        paper_id = row['id']
+                        conn.execute(
+                            """UPDATE papers SET title = ?, original_abstract = ?, chinese_abstract = ?,
+                               main_contribution = ?, ai_keywords = ?, relevance_score = ? WHERE id = ?""",
+                            (paper['title'], paper.get('original_abstract', ''), paper.get('chinese_abstract', ''),
+                             paper.get('main_contribution', ''), ai_keywords, paper.get('relevance_score'), paper_id)
+                        )
+                        conn.execute("DELETE FROM papers_fts WHERE rowid = ?", (paper_id,))
+                    else:
+                        cursor = conn.execute(
+                            """INSERT INTO papers (link, date, title, original_abstract, chinese_abstract,
+                               main_contribution, ai_keywords, relevance_score) VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                            (paper['link'], date, paper['title'], paper.get('original_abstract', ''),
+                             paper.get('chinese_abstract', ''), paper.get('main_contribution', ''),
+                             ai_keywords, paper.get('relevance_score'))
+                        )
+                        paper_id = cursor.lastrowid
+
+                    conn.execute(
+                        "INSERT INTO papers_fts (rowid, title, abstract, chinese_abstract, ai_keywords) VALUES (?, ?, ?, ?, ?)",
+                        (paper_id, _segment(paper['title']), _segment(paper.get('original_abstract', '')),
+                         _segment(paper.get('chinese_abstract', '')), _segment(ai_keywords))
+                    )
+                    conn.execute(
+                        "INSERT OR IGNORE INTO paper_keywords (paper_id, keyword) VALUES (?, ?)",
+                        (paper_id, keyword)
+                    )
+                    paper_ids.add(paper_id)
+    finally:
+        conn.close()
+
+    return len(paper_ids)
+
+
+def search_papers(query, since=None, until=None, keyword=None, min_score=None, limit=20,
+                  db_path=SEARCH_INDEX_PATH):
+    """Search indexed papers with BM25 ranking.
+
+    Args:
+        query: Free text query (English and/or Chinese), may be empty to list by date
+        since: Earliest date (YYYY-MM-DD, inclusive)
+        until: Latest date (YYYY-MM-DD, inclusive)
+        keyword: Only return papers that matched this subscription keyword
+        min_score: Minimum AI relevance score
+        limit: Maximum number of results
+        db_path: Path of the SQLite database file
+
+    Returns:
+        list: List of result dictionaries ordered by relevance
+    """
+    match = _build_match_query(query or '')
+    conditions = []
+    params = []
+
+    if match:
+        sql = """SELECT p.*, bm25(papers_fts, ?, ?, ?, ?) AS rank
+                 FROM papers_fts JOIN papers p ON p.id = papers_fts.rowid"""
+        params.extend(BM25_WEIGHTS)
+        conditions.append("papers_fts MATCH ?")
+        params.append(match)
+        order = "rank, p.date DESC"
+    else:
+        sql = "SELECT p.*, 0.0 AS rank FROM papers p"
+        order = "p.date DESC, p.relevance_score DESC"
+
+    if since:
+        conditions.append("p.date >= ?")
+        params.append(since)
+    if until:
+        conditions.append("p.date <= ?")
+        params.append(until)
+    if min_score is not None:
+        conditions.append("p.relevance_score >= ?")
+        params.append(min_score)
+    if keyword:
+        conditions.append(
+            "EXISTS (SELECT 1 FROM paper_keywords k WHERE k.paper_id = p.id AND k.keyword = ? COLLATE NOCASE)"
+        )
+        params.append(keyword)
+
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += f" ORDER BY {order} LIMIT ?"
+    params.append(limit)
+
+    if not os.path.exists(db_path):
+        return []
+
+    conn = open_search_index(db_path)
+    try:
+        rows = conn.execute(sql, params).fetchall()
+        results = []
+        for row in rows:
+            result = dict(row)
+            result['ai_keywords'] = [kw for kw in (result['ai_keywords'] or '').split(', ') if kw]
+            results.append(result)
+        return results
+    finally:
+        conn.close()
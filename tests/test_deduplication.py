@@ -0,0 +1,118 @@
+"""Tests for partitioned paper history storage and compaction."""
+
+import datetime
+import gzip
+import json
+import os
+import sys
+import types
+
+import pytest
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils import deduplication
+from utils.deduplication import compact_papers, load_previous_papers, save_today_papers
+
+
+@pytest.fixture
+def set_today(tmp_path, monkeypatch):
+    """Run in an empty directory with a controllable ``date.today()``."""
+    monkeypatch.chdir(tmp_path)
+
+    def set_date(year, month, day):
+        class FakeDate(datetime.date):
+            @classmethod
+            def today(cls):
+                return cls(year, month, day)
+
+        monkeypatch.setattr(deduplication, 'datetime',
+                            types.SimpleNamespace(date=FakeDate, timedelta=datetime.timedelta))
+
+    return set_date
+
+
+def write_yaml(date_str, titles):
+    os.makedirs('papers', exist_ok=True)
+    with open(os.path.join('papers', f"{date_str}.yaml"), 'w', encoding='utf-8') as f:
+        yaml.dump({'date': date_str, 'total_count': len(titles), 'papers': titles}, f, allow_unicode=True)
+
+
+def read_partition(month_str):
+    with gzip.open(os.path.join('papers', f"{month_str}.jsonl.gz"), 'rt', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_second_save_on_same_day_replaces_first(set_today):
+    set_today(2026, 8, 21)
+    save_today_papers({'a': None, 'b': None})
+    save_today_papers({'c': None})
+
+    set_today(2026, 8, 22)
+    assert load_previous_papers() == {'c'}
+
+
+def test_lookback_on_first_of_month_reads_previous_partition(set_today):
+    set_today(2026, 7, 31)
+    save_today_papers({'july': None})
+
+    set_today(2026, 8, 1)
+    assert compact_papers() == 1
+    assert not os.listdir(os.path.join('papers', 'segments'))
+    assert read_partition('2026-07') == [{'date': '2026-07-31', 'papers': ['july']}]
+    assert load_previous_papers() == {'july'}
+
+
+def test_segment_beats_legacy_yaml_for_same_date(set_today):
+    write_yaml('2026-07-10', ['legacy'])
+    set_today(2026, 7, 10)
+    save_today_papers({'segment': None})
+
+    set_today(2026, 7, 11)
+    assert load_previous_papers() == {'segment'}
+
+    set_today(2026, 8, 1)
+    compact_papers()
+    assert read_partition('2026-07') == [{'date': '2026-07-10', 'papers': ['segment']}]
+
+
+def test_compaction_twice_is_safe(set_today):
+    write_yaml('2026-06-01', ['a'])
+    write_yaml('2026-06-02', ['b'])
+    set_today(2026, 7, 3)
+
+    assert compact_papers() == 2
+    first = read_partition('2026-06')
+    assert compact_papers() == 0
+    assert read_partition('2026-06') == first == [
+        {'date': '2026-06-01', 'papers': ['a']},
+        {'date': '2026-06-02', 'papers': ['b']},
+    ]
+    assert not os.path.exists(os.path.join('papers', '2026-06-01.yaml'))
+
+
+def test_current_month_is_left_alone(set_today):
+    write_yaml('2026-08-01', ['legacy'])
+    set_today(2026, 8, 2)
+    save_today_papers({'today': None})
+
+    assert compact_papers() == 0
+    assert os.path.exists(os.path.join('papers', '2026-08-01.yaml'))
+    assert os.path.exists(os.path.join('papers', 'segments', '2026-08-02.jsonl.gz'))
+    assert not os.path.exists(os.path.join('papers', '2026-08.jsonl.gz'))
+
+
+def test_corrupt_partition_is_not_deleted(set_today):
+    set_today(2026, 7, 5)
+    save_today_papers({'a': None})
+    partition = os.path.join('papers', '2026-07.jsonl.gz')
+    with open(partition, 'wb') as f:
+        f.write(b'not gzip')
+
+    set_today(2026, 8, 1)
+    assert compact_papers() == 0
+    with open(partition, 'rb') as f:
+        assert f.read() == b'not gzip'
+    assert os.path.exists(os.path.join('papers', 'segments', '2026-07-05.jsonl.gz'))
+    assert not os.path.exists(partition + '.tmp')
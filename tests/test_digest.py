@@ -0,0 +1,76 @@
+"""Tests for digest shaping and the rendered section counts."""
+
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from mailer import generate_email_html, shape_digest
+
+
+def paper(link, score):
+    return {
+        'title': f"Paper {link}",
+        'link': link,
+        'original_abstract': 'abstract',
+        'chinese_abstract': '摘要',
+        'main_contribution': '',
+        'ai_keywords': [],
+        'relevance_score': score,
+    }
+
+
+def links(section):
+    return [p['link'] for p in section]
+
+
+def test_papers_are_kept_in_first_matching_section():
+    digest, overflow, hidden = shape_digest({
+        'bev': [paper('a', 4), paper('b', 3)],
+        'lane': [paper('b', 3), paper('c', 5)],
+    })
+
+    assert links(digest['bev']) == ['a', 'b']
+    assert links(digest['lane']) == ['c']
+    assert overflow == {} and hidden == {}
+
+
+def test_papers_below_min_score_are_dropped():
+    digest, _, _ = shape_digest({
+        'bev': [paper('a', 1), paper('b', 2)],
+        'lane': [paper('c', 1)],
+    }, min_score=2)
+
+    assert links(digest['bev']) == ['b']
+    assert 'lane' not in digest
+
+
+def test_top_n_sorted_by_score_with_ties_in_arrival_order():
+    papers = [paper('a', 3), paper('b', 5), paper('c', 3), paper('d', 5), paper('e', 3)]
+    digest, overflow, hidden = shape_digest({'bev': papers}, top_n=3, overflow_limit=10)
+
+    assert links(digest['bev']) == ['b', 'd', 'a']
+    assert links(overflow['bev']) == ['c', 'e']
+    assert hidden == {'bev': 0}
+
+
+def test_overflow_is_capped_and_rest_counted():
+    papers = [paper(str(i), 5 - i % 3) for i in range(10)]
+    digest, overflow, hidden = shape_digest({'bev': papers}, top_n=2, overflow_limit=3)
+
+    assert len(digest['bev']) == 2
+    assert len(overflow['bev']) == 3
+    assert hidden == {'bev': 5}
+    assert all(p['relevance_score'] == 5 for p in digest['bev'])
+
+
+def test_rendered_paper_count_includes_overflow_and_hidden():
+    papers = [paper(str(i), 3) for i in range(10)]
+    digest, overflow, hidden = shape_digest({'bev': papers}, top_n=2, overflow_limit=3)
+    html = generate_email_html(digest, None, '自动驾驶', overflow, hidden)
+
+    assert re.search(r'keyword-badge">10 papers<', html)
+    assert html.count('class="paper-details"') == 2
+    assert html.count('<li>') == 3
+    assert '另有 5 篇未列出' in html
@@ -0,0 +1,123 @@
+"""Tests for paper processing with the AI client."""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from ai import processor
+from ai.processor import process_abstract_with_ai, process_papers_with_ai, score_relevance_with_ai
+
+
+class FakeClient:
+    """Answer screening calls from ``scores`` and everything else with fixed JSON."""
+
+    def __init__(self, scores):
+        self.scores = scores
+        self.calls = []
+
+    def complete(self, messages, light=False):
+        prompt = messages[1]['content']
+        self.calls.append(('light' if light else 'large', prompt))
+        if light:
+            for title, reply in self.scores.items():
+                if f"标题：{title}\n" in prompt:
+                    return reply
+            raise AssertionError("unexpected screening prompt")
+        if '逐句' in prompt:
+            sentences = json.loads(prompt.split('待翻译句子（JSON列表）：\n')[1].split('\n\n')[0])
+            return json.dumps({'translations': [f"译:{s}" for s in sentences], 'terms': {}})
+        return json.dumps({'keywords': ['关键词'], 'main_contribution': '贡献', 'relevance_score': 5})
+
+
+@pytest.fixture
+def sleeps(tmp_path, monkeypatch):
+    # Translation memory is written relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    calls = []
+    monkeypatch.setattr(processor.time, 'sleep', calls.append)
+    return calls
+
+
+@pytest.mark.parametrize('reply, expected', [
+    ('4', 4),
+    (' 2\n', 2),
+    ('按照1-5分的标准，评分为4', None),
+    ('5分', None),
+    ('', None),
+])
+def test_score_reply_must_be_a_single_digit(reply, expected):
+    assert score_relevance_with_ai(FakeClient({'t': reply}), 't', 'a', 'd') == expected
+
+
+def test_cascade_skips_low_scores_without_sleeping(sleeps):
+    client = FakeClient({'low': '1'})
+    res = process_papers_with_ai({'k': [('low', 'l1', 'Abstract.')]}, client, 'd', cascade_threshold=3)
+
+    assert res['k'][0]['relevance_score'] == 1
+    assert res['k'][0]['chinese_abstract'] == 'Abstract.'
+    assert [kind for kind, _ in client.calls] == ['light']
+    assert sleeps == []
+
+
+def test_cascade_sends_relevant_papers_to_large_model(sleeps):
+    client = FakeClient({'high': '4'})
+    res = process_papers_with_ai({'k': [('high', 'l1', 'Abstract.')]}, client, 'd', cascade_threshold=3)
+
+    paper = res['k'][0]
+    assert paper['relevance_score'] == 5
+    assert paper['chinese_abstract'] == '译:Abstract.'
+    assert paper['main_contribution'] == '贡献'
+    assert sorted(kind for kind, _ in client.calls) == ['large', 'large', 'light']
+    assert sleeps == [5]
+
+
+def test_cascade_treats_unparseable_score_as_relevant(sleeps):
+    client = FakeClient({'odd': '按照1-5分的标准，评分为4'})
+    res = process_papers_with_ai({'k': [('odd', 'l1', 'Abstract.')]}, client, 'd', cascade_threshold=3)
+
+    assert res['k'][0]['relevance_score'] == 5
+    assert res['k'][0]['main_contribution'] == '贡献'
+    assert sleeps == [5]
+
+
+class FailingClient(FakeClient):
+    """Fail either the translation call or the analysis call."""
+
+    def __init__(self, fail):
+        super().__init__({})
+        self.fail = fail
+
+    def complete(self, messages, light=False):
+        is_translation = '逐句' in messages[1]['content']
+        if (self.fail == 'translation') == is_translation:
+            raise RuntimeError("fake failure")
+        return super().complete(messages, light)
+
+
+def test_concurrent_analysis_prompt_omits_translation():
+    client = FakeClient({})
+    memory = {'sentences': {}, 'terms': {}}
+    result = process_abstract_with_ai(client, 't', 'First. Second.', 'd', memory)
+
+    assert result == ('译:First.译:Second.', '贡献', ['关键词'], 5)
+    analysis = [prompt for kind, prompt in client.calls if '逐句' not in prompt]
+    assert len(analysis) == 1
+    assert '翻译' not in analysis[0] and 'chinese_abstract' not in analysis[0]
+
+
+def test_translation_failure_keeps_analysis():
+    memory = {'sentences': {}, 'terms': {}}
+    result = process_abstract_with_ai(FailingClient('translation'), 't', 'Abstract.', 'd', memory)
+
+    assert result == ('Abstract.', '贡献', ['关键词'], 5)
+
+
+def test_analysis_failure_keeps_translation():
+    memory = {'sentences': {}, 'terms': {}}
+    result = process_abstract_with_ai(FailingClient('analysis'), 't', 'Abstract.', 'd', memory)
+
+    assert result == ('译:Abstract.', '', [], 3)
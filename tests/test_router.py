@@ -0,0 +1,199 @@
+"""Tests for ProviderRouter against local fake OpenAI-compatible servers."""
+
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from ai.router import ProviderRouter
+
+
+def start_fake_server(reply, delay=0.0, status=200, missing_model=None, statuses=None):
+    """Start a fake chat completions endpoint on a free local port.
+
+    Requests for ``missing_model`` are answered with 404; ``statuses`` cycles
+    through the given status codes request by request.
+    """
+    status_cycle = itertools.cycle(statuses or [status])
+    cycle_lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            time.sleep(delay)
+            with cycle_lock:
+                code = next(status_cycle)
+            if request['model'] == missing_model:
+                code = 404
+            if code != 200:
+                body = json.dumps({'error': {'message': 'fake failure'}}).encode()
+            else:
+                body = json.dumps({
+                    'id': 'fake', 'object': 'chat.completion', 'created': 0, 'model': 'fake',
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': reply}}],
+                }).encode()
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def provider(name, server):
+    return {
+        'name': name,
+        'base_url': f"http://127.0.0.1:{server.server_address[1]}/v1",
+        'api_key': 'fake',
+        'model': 'fake-model',
+        'timeout': 5,
+    }
+
+
+@pytest.fixture
+def servers():
+    started = []
+
+    def start(*args, **kwargs):
+        server = start_fake_server(*args, **kwargs)
+        started.append(server)
+        return server
+
+    yield start
+    for server in started:
+        server.shutdown()
+        server.server_close()
+
+
+MESSAGES = [{'role': 'user', 'content': 'hi'}]
+
+
+def test_failover_to_healthy_provider(servers):
+    bad = servers('bad', status=500)
+    good = servers('good')
+    router = ProviderRouter([provider('bad', bad), provider('good', good)])
+
+    assert router.complete(MESSAGES) == 'good'
+    assert [p['name'] for p in router.ranked_providers()] == ['good', 'bad']
+    router.close()
+
+
+def test_circuit_opens_and_recovers_after_cooldown(servers):
+    bad = servers('bad', status=500)
+    good = servers('good')
+    router = ProviderRouter([provider('bad', bad), provider('good', good)],
+                            failure_threshold=1, cooldown=0.3)
+
+    assert router.complete(MESSAGES) == 'good'
+    assert [p['name'] for p in router.ranked_providers()] == ['good']
+
+    time.sleep(0.4)
+    assert [p['name'] for p in router.ranked_providers()] == ['good', 'bad']
+    router.close()
+
+
+def test_last_provider_circuit_never_opens(servers):
+    bad = servers('bad', status=500)
+    router = ProviderRouter([provider('bad', bad)], failure_threshold=1, max_retries=0)
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError, match="调用失败"):
+            router.complete(MESSAGES)
+    assert [p['name'] for p in router.ranked_providers()] == ['bad']
+    router.close()
+
+
+def test_single_provider_retries_rate_limits(servers):
+    flaky = servers('ok', statuses=[429, 200])
+    router = ProviderRouter([provider('flaky', flaky)], failure_threshold=1, retry_backoff=0.01)
+
+    for _ in range(3):
+        assert router.complete(MESSAGES) == 'ok'
+    assert [p['name'] for p in router.ranked_providers()] == ['flaky']
+    router.close()
+
+
+def test_non_retryable_error_is_not_retried(servers):
+    missing = servers('never', missing_model='fake-model')
+    router = ProviderRouter([provider('missing', missing)], retry_backoff=5.0)
+
+    start = time.monotonic()
+    with pytest.raises(RuntimeError, match="调用失败"):
+        router.complete(MESSAGES)
+    assert time.monotonic() - start < 1.0
+    router.close()
+
+
+def test_hedged_request_returns_faster_answer(servers):
+    slow = servers('slow', delay=1.5)
+    fast = servers('fast', delay=0.05)
+    router = ProviderRouter([provider('slow', slow), provider('fast', fast)],
+                            hedge=True, hedge_delay=0.2)
+
+    start = time.monotonic()
+    assert router.complete(MESSAGES) == 'fast'
+    assert time.monotonic() - start < 1.0
+    router.close()
+
+
+def test_hedge_uses_fixed_delay_until_enough_samples(servers):
+    fast = servers('fast')
+    router = ProviderRouter([provider('fast', fast)], hedge=True, hedge_delay=7.0)
+
+    router.complete(MESSAGES)
+    assert router._hedge_timeout(router.providers[0]) == 7.0
+    router.close()
+
+
+def test_failing_light_model_does_not_open_main_circuit(servers):
+    server = servers('main', missing_model='fake-light')
+    config = dict(provider('only', server), light_model='fake-light')
+    router = ProviderRouter([config], failure_threshold=3, cooldown=60)
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            router.complete(MESSAGES, light=True)
+
+    assert router.complete(MESSAGES) == 'main'
+    router.close()
+
+
+def test_failing_light_model_opens_only_light_circuit(servers):
+    light = servers('light-ok')
+    main = servers('main', missing_model='fake-light')
+    router = ProviderRouter([dict(provider('main', main), light_model='fake-light'),
+                             dict(provider('light', light), light_model='fake-light')],
+                            failure_threshold=1, cooldown=60)
+
+    assert router.complete(MESSAGES, light=True) in ('main', 'light-ok')
+    for _ in range(2):
+        router.complete(MESSAGES, light=True)
+    assert [p['name'] for p in router.ranked_providers(light=True)] == ['light']
+    assert sorted(p['name'] for p in router.ranked_providers()) == ['light', 'main']
+    router.close()
+
+    assert router.complete(MESSAGES) == 'main'
+    router.close()
+
+
+def test_light_calls_prefer_providers_with_light_model(servers):
+    plain = servers('plain')
+    tiered = servers('tiered')
+    router = ProviderRouter([provider('plain', plain), dict(provider('tiered', tiered), light_model='fake-light')])
+
+    assert router.complete(MESSAGES, light=True) == 'tiered'
+    router.close()
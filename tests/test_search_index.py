@@ -0,0 +1,117 @@
+"""Tests for the local full-text search index."""
+
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils.search_index import index_papers, open_search_index, search_papers
+
+
+def paper(link, title, abstract='', chinese_abstract='', ai_keywords=(), score=3):
+    return {
+        'title': title,
+        'link': link,
+        'original_abstract': abstract,
+        'chinese_abstract': chinese_abstract,
+        'main_contribution': '',
+        'ai_keywords': list(ai_keywords),
+        'relevance_score': score,
+    }
+
+
+def titles(results):
+    return [r['title'] for r in results]
+
+
+def test_chinese_characters_match(tmp_path):
+    db = str(tmp_path / 'search.db')
+    index_papers({'occupancy': [
+        paper('l1', 'Occupancy A', chinese_abstract='我们提出一种三维占用网络。'),
+        paper('l2', 'Lane B', chinese_abstract='车道线检测方法。'),
+    ]}, date='2026-01-01', db_path=db)
+
+    assert titles(search_papers('占用网络', db_path=db)) == ['Occupancy A']
+    assert titles(search_papers('车道', db_path=db)) == ['Lane B']
+    assert search_papers('网络 车道', db_path=db) == []
+
+
+def test_keyword_filter_is_case_insensitive(tmp_path):
+    db = str(tmp_path / 'search.db')
+    index_papers({'BEV': [paper('l1', 'BEV fusion'), paper('l2', 'BEV lanes')],
+                  'lane': [paper('l2', 'BEV lanes')]}, date='2026-01-01', db_path=db)
+
+    assert sorted(titles(search_papers('bev', keyword='bev', db_path=db))) == ['BEV fusion', 'BEV lanes']
+    assert titles(search_papers('bev', keyword='LANE', db_path=db)) == ['BEV lanes']
+
+
+def test_reindex_updates_in_place_and_adds_keyword(tmp_path):
+    db = str(tmp_path / 'search.db')
+    assert index_papers({'nerf': [paper('l1', 'Old title', abstract='radiance')]},
+                        date='2026-01-01', db_path=db) == 1
+    assert index_papers({'nerf': [paper('l1', 'New title', abstract='gaussian', score=5)],
+                         'gaussian': [paper('l1', 'New title', abstract='gaussian', score=5)]},
+                        date='2026-01-02', db_path=db) == 1
+
+    assert search_papers('radiance', db_path=db) == []
+    results = search_papers('gaussian', db_path=db)
+    assert titles(results) == ['New title']
+    assert results[0]['relevance_score'] == 5
+    assert results[0]['date'] == '2026-01-01'
+    assert titles(search_papers('gaussian', keyword='nerf', db_path=db)) == ['New title']
+
+    conn = open_search_index(db)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0] == 1
+        assert conn.execute("SELECT COUNT(*) FROM papers_fts").fetchone()[0] == 1
+    finally:
+        conn.close()
+
+
+def test_date_and_score_filters(tmp_path):
+    db = str(tmp_path / 'search.db')
+    index_papers({'k': [paper('l1', 'Point cloud early', score=2)]}, date='2026-01-01', db_path=db)
+    index_papers({'k': [paper('l2', 'Point cloud late', score=5)]}, date='2026-03-01', db_path=db)
+
+    assert titles(search_papers('point cloud', since='2026-02-01', db_path=db)) == ['Point cloud late']
+    assert titles(search_papers('point cloud', until='2026-01-01', db_path=db)) == ['Point cloud early']
+    assert titles(search_papers('point cloud', min_score=4, db_path=db)) == ['Point cloud late']
+    assert titles(search_papers('', db_path=db)) == ['Point cloud late', 'Point cloud early']
+
+
+def test_query_latency_over_years_of_history(tmp_path):
+    db = str(tmp_path / 'search.db')
+    rng = random.Random(0)
+    vocabulary = [f"term{i}" for i in range(5000)]
+    keywords = ['BEV', 'occupancy', 'nerf', 'lane', 'detect']
+    start = datetime.date(2023, 1, 1)
+
+    # Three years of daily runs with 15 matched papers per day
+    for day in range(3 * 365):
+        date = (start + datetime.timedelta(days=day)).strftime('%Y-%m-%d')
+        papers = {}
+        for i in range(15):
+            words = ' '.join(rng.choice(vocabulary) for _ in range(150))
+            papers.setdefault(rng.choice(keywords), []).append(
+                paper(f"{date}-{i}", f"Paper {date} {i} {rng.choice(vocabulary)}", abstract=words,
+                      chinese_abstract='基于鸟瞰图的三维占用预测。', score=rng.randint(1, 5))
+            )
+        index_papers(papers, date=date, db_path=db)
+
+    queries = [
+        dict(query='term42 term7'),
+        dict(query='占用预测', since='2025-06-01', min_score=4),
+        dict(query='term1234', keyword='occupancy'),
+        dict(query='', since='2025-12-01', until='2025-12-31'),
+    ]
+    for kwargs in queries:
+        search_papers(db_path=db, **kwargs)
+        timings = []
+        for _ in range(5):
+            begin = time.perf_counter()
+            search_papers(db_path=db, **kwargs)
+            timings.append(time.perf_counter() - begin)
+        assert sorted(timings)[len(timings) // 2] < 0.1, kwargs
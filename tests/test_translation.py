@@ -0,0 +1,89 @@
+"""Tests for sentence-level translation memory."""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from ai import translation
+from ai.translation import (build_glossary, load_translation_memory, save_translation_memory,
+                            split_sentences, translate_abstract)
+
+
+class FakeClient:
+    """Translate each requested sentence, optionally returning too few."""
+
+    def __init__(self, drop=0):
+        self.drop = drop
+        self.requests = []
+
+    def complete(self, messages, light=False):
+        prompt = messages[1]['content']
+        sentences = json.loads(prompt.split('待翻译句子（JSON列表）：\n')[1].split('\n\n')[0])
+        self.requests.append(sentences)
+        translations = [f"<{s}>" for s in sentences]
+        return json.dumps({'translations': translations[self.drop:], 'terms': {'BEV': '鸟瞰图'}})
+
+
+def new_memory():
+    return {'sentences': {}, 'terms': {}}
+
+
+def test_split_sentences_keeps_abbreviations():
+    text = "Results are e.g. 3.5 better. See Fig. 2 and Smith et al. 2020. I play piano. Done."
+    assert split_sentences(text) == [
+        "Results are e.g. 3.5 better.",
+        "See Fig. 2 and Smith et al. 2020.",
+        "I play piano.",
+        "Done.",
+    ]
+
+
+def test_cached_sentences_are_not_requested_again():
+    memory = new_memory()
+    client = FakeClient()
+
+    assert translate_abstract(client, "We use BEV. It works.", memory) == "<We use BEV.><It works.>"
+    assert translate_abstract(client, "We use BEV. New result.", memory) == "<We use BEV.><New result.>"
+    assert client.requests[-1] == ["New result."]
+    assert memory['terms'] == {'BEV': {'鸟瞰图': 2}}
+
+
+def test_misaligned_response_falls_back_to_original():
+    memory = new_memory()
+    translate_abstract(FakeClient(), "Cached one.", memory)
+
+    abstract = "Cached one. New one. Another one."
+    assert translate_abstract(FakeClient(drop=1), abstract, memory) == abstract
+    assert "New one." not in memory['sentences']
+
+
+def test_glossary_matches_whole_word_phrases():
+    memory = new_memory()
+    memory['terms'] = {
+        'point cloud': {'点云': 3},
+        'NeRF': {'神经辐射场': 2},
+        'cloud': {'云': 1},
+        '3D-GS': {'三维高斯泼溅': 1},
+    }
+
+    glossary = build_glossary(memory, "Cloudy point  clouds. A Point Cloud and 3D-GS scene.")
+    assert glossary == {'point cloud': '点云', 'cloud': '云', '3D-GS': '三维高斯泼溅'}
+
+
+def test_save_prunes_rare_renderings_and_terms(tmp_path, monkeypatch):
+    monkeypatch.setattr(translation, 'MAX_MEMORY_TERMS', 2)
+    memory = new_memory()
+    memory['terms'] = {
+        'BEV': {'鸟瞰图': 5, 'BEV视角': 1},
+        'occupancy': {'占用': 1, '占据': 1},
+        'lane': {'车道': 1},
+    }
+    path = str(tmp_path / 'memory.json')
+
+    save_translation_memory(memory, path)
+    assert load_translation_memory(path)['terms'] == {
+        'BEV': {'鸟瞰图': 5},
+        'occupancy': {'占用': 1, '占据': 1},
+    }